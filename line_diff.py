@@ -0,0 +1,146 @@
+"""
+줄 단위 비교(diff) 유틸리티.
+Myers의 O((N+M)D) 선형 공간 알고리즘으로 두 줄 목록의 최장 공통 부분열을 구하고,
+difflib.SequenceMatcher.get_opcodes()와 같은 형식의 opcode 목록을 만듭니다.
+rapidfuzz가 설치되어 있으면 최장 공통 부분열 계산을 C++ 구현(Indel 거리)에 맡깁니다.
+"""
+from typing import List, Sequence, Tuple
+
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:  # 선택 의존성: 없으면 아래의 순수 파이썬 Myers 구현을 사용
+    Indel = None
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def _middle_snake(a: Sequence[int], a_lo: int, a_hi: int,
+                  b: Sequence[int], b_lo: int, b_hi: int) -> Tuple[int, int, int, int]:
+    """최단 편집 경로의 가운데 스네이크 (x, y) -> (u, v)를 절대 좌표로 반환합니다."""
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    delta = n - m
+    odd = delta & 1
+    max_d = (n + m + 1) // 2
+    offset = max_d + 1
+    # vf: 정방향 대각선 k별 최대 도달 x / vb: 역방향(끝에서부터) 대각선 k별 최대 도달 x
+    vf = [0] * (2 * max_d + 3)
+    vb = [0] * (2 * max_d + 3)
+
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[offset + k - 1] < vf[offset + k + 1]):
+                x = vf[offset + k + 1]
+            else:
+                x = vf[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            vf[offset + k] = x
+            back_k = delta - k
+            if odd and -(d - 1) <= back_k <= d - 1 and x + vb[offset + back_k] >= n:
+                return a_lo + x0, b_lo + y0, a_lo + x, b_lo + y
+
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vb[offset + k - 1] < vb[offset + k + 1]):
+                x = vb[offset + k + 1]
+            else:
+                x = vb[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_hi - 1 - x] == b[b_hi - 1 - y]:
+                x += 1
+                y += 1
+            vb[offset + k] = x
+            fwd_k = delta - k
+            if not odd and -d <= fwd_k <= d and x + vf[offset + fwd_k] >= n:
+                return a_lo + n - x, b_lo + m - y, a_lo + n - x0, b_lo + m - y0
+
+    raise AssertionError("middle snake not found")
+
+
+def _lcs_pairs(a: Sequence[int], b: Sequence[int]) -> List[Tuple[int, int]]:
+    """a, b의 최장 공통 부분열을 이루는 (i, j) 쌍을 i 오름차순으로 반환합니다."""
+    pairs = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        a_lo, a_hi, b_lo, b_hi = stack.pop()
+        # 공통 접두/접미 부분은 편집 경로 탐색 없이 바로 일치로 처리
+        while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+            pairs.append((a_lo, b_lo))
+            a_lo += 1
+            b_lo += 1
+        while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+            pairs.append((a_hi, b_hi))
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+        x, y, u, v = _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi)
+        pairs.extend((x + k, y + k) for k in range(u - x))
+        stack.append((a_lo, x, b_lo, y))
+        stack.append((u, a_hi, v, b_hi))
+    pairs.sort()
+    return pairs
+
+
+def _indel_pairs(a: Sequence[int], b: Sequence[int]) -> List[Tuple[int, int]]:
+    """rapidfuzz의 Indel(삽입/삭제만 허용하는 LCS 기반) opcode에서 일치 쌍 (i, j)를 뽑아 반환합니다."""
+    pairs = []
+    for tag, i1, i2, j1, j2 in Indel.opcodes(a, b).as_list():
+        if tag == 'equal':
+            pairs.extend(zip(range(i1, i2), range(j1, j2)))
+    return pairs
+
+
+def diff_opcodes(a: List[str], b: List[str]) -> List[Opcode]:
+    """두 줄 목록을 비교해 difflib 형식의 (tag, i1, i2, j1, j2) opcode 목록을 반환합니다."""
+    n, m = len(a), len(b)
+    # 앞뒤의 공통 줄(대부분 그대로인 파일에서는 거의 전부)은 ID 변환이나 탐색 없이 바로 일치 구간으로 처리
+    lo = 0
+    while lo < n and lo < m and a[lo] == b[lo]:
+        lo += 1
+    a_hi, b_hi = n, m
+    while a_hi > lo and b_hi > lo and a[a_hi - 1] == b[b_hi - 1]:
+        a_hi -= 1
+        b_hi -= 1
+
+    # 각 줄을 정수 ID로 바꿔 이후 비교를 정수 비교로 처리
+    ids = {}
+    a_ids = [ids.setdefault(a[i], len(ids)) for i in range(lo, a_hi)]
+    b_ids = [ids.setdefault(b[j], len(ids)) for j in range(lo, b_hi)]
+
+    # 한쪽에만 있는 줄은 절대 일치할 수 없으므로 미리 제외 (번역본에서는 대부분의 줄이 해당)
+    common = set(a_ids).intersection(b_ids)
+    a_index = [lo + i for i, line_id in enumerate(a_ids) if line_id in common]
+    b_index = [lo + j for j, line_id in enumerate(b_ids) if line_id in common]
+    # Levenshtein과 달리 Indel은 '교체'를 쓰지 않으므로 difflib/Myers와 같은 최장 공통 부분열 기준의 결과를 냄
+    lcs_pairs = _indel_pairs if Indel is not None else _lcs_pairs
+    pairs = lcs_pairs([a_ids[i - lo] for i in a_index], [b_ids[j - lo] for j in b_index])
+
+    # 원래 위치로 되돌린 일치 쌍을 연속 구간(matching block)으로 묶음
+    blocks = [[0, 0, lo]] if lo else []
+    for i, j, size in [(a_index[p], b_index[q], 1) for p, q in pairs] + [(a_hi, b_hi, n - a_hi)]:
+        if not size:
+            continue
+        if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+            blocks[-1][2] += size
+        else:
+            blocks.append([i, j, size])
+    blocks.append([n, m, 0])
+
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in blocks:
+        if i < ai and j < bj:
+            opcodes.append(('replace', i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(('delete', i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(('insert', i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(('equal', ai, i, bj, j))
+    return opcodes
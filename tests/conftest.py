@@ -0,0 +1,18 @@
+"""
+테스트 공용 설정.
+저장소 루트의 스크립트 모듈(twee_validator 등)을 import할 수 있도록 경로를 추가합니다.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def tv():
+    pytest.importorskip("ahocorasick")
+    import twee_validator
+    return twee_validator
@@ -0,0 +1,52 @@
+import os
+import pickle
+
+import pytest
+
+
+@pytest.fixture
+def glossary(tv, monkeypatch, tmp_path):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(tv, "VALIDATOR_CACHE_DIR", cache_dir)
+    tv._load_glossary_automaton.cache_clear()
+    path = tmp_path / "glossary.txt"
+    path.write_text("# 용어집\nRobin: 로빈\nWhitney: 휘트니\n", 'utf-8')
+    yield path, cache_dir
+    tv._load_glossary_automaton.cache_clear()
+
+
+def _load(tv, path):
+    tv._load_glossary_automaton.cache_clear()
+    return tv._load_glossary_automaton(path, path.stat().st_mtime_ns)
+
+
+def test_glossary_pickle_is_rebuilt_when_corrupt(tv, glossary):
+    path, cache_dir = glossary
+    _, terms = _load(tv, path)
+    assert terms == {"Robin": "로빈", "Whitney": "휘트니"}
+    (pickle_path,) = cache_dir.iterdir()
+
+    # 덜 쓴 파일을 읽더라도 예외 없이 다시 구성하고 올바른 파일로 덮어씀
+    pickle_path.write_bytes(pickle_path.read_bytes()[:20])
+    assert _load(tv, path)[1] == terms
+    assert pickle.loads(pickle_path.read_bytes())[3] == terms
+    assert [p.name for p in cache_dir.iterdir()] == [pickle_path.name]
+
+
+def test_failed_glossary_pickle_write_keeps_previous_file(tv, glossary, monkeypatch):
+    path, cache_dir = glossary
+    _load(tv, path)
+    (pickle_path,) = cache_dir.iterdir()
+    previous = pickle_path.read_bytes()
+
+    def fail(obj, file, protocol=None):
+        file.write(b"partial")
+        raise OSError("disk full")
+
+    # 쓰는 도중 실패해도 기존 캐시 파일은 그대로이고 임시 파일도 남지 않음
+    path.write_text("Robin: 로빈\n", 'utf-8')
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    monkeypatch.setattr(tv.pickle, "dump", fail)
+    assert _load(tv, path)[1] == {"Robin": "로빈"}
+    assert pickle_path.read_bytes() == previous
+    assert [p.name for p in cache_dir.iterdir()] == [pickle_path.name]
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+ORIGINAL = ":: Start\nHello there, how are you?\n<<set $x to 1>>\n[[Go home|Home]]\n"
+
+
+def _run(tv, translated, **kwargs):
+    validator = tv.TweeL10nValidator(Path("o.twee"), Path("t.twee"), None, original_text=ORIGINAL, translated_text=translated,
+                                     verbose=False, **kwargs)
+    validator.run_all_checks()
+    return validator.issues
+
+
+def test_line_cache_is_opt_in_and_capped(tv, monkeypatch, tmp_path):
+    monkeypatch.setattr(tv, "VALIDATOR_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(tv, "LINE_CACHE_MAX_FILES", 3)
+    (tmp_path / "v0-stale.pkl").write_bytes(b"old")
+    translations = [f":: Start\n안녕 {k}\n<<set $x to 1>>\n[[집으로|Home]]\n" for k in range(4)]
+
+    _run(tv, translations[0])
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["v0-stale.pkl"]
+
+    for translated in translations:
+        fresh = _run(tv, translated, use_cache=True)
+        assert _run(tv, translated, use_cache=True) == fresh
+
+    names = [path.name for path in tmp_path.iterdir()]
+    assert "v0-stale.pkl" not in names
+    assert len(names) == 3
+    assert not [name for name in names if name.endswith(".tmp")]
@@ -0,0 +1,26 @@
+import pytest
+
+
+def _issue_types(tv, original, translated):
+    validator = tv.TweeL10nValidator.from_strings(original, translated)
+    validator.run_all_checks()
+    return [issue["type"] for issue in validator.issues]
+
+
+@pytest.mark.parametrize("original, translated", [
+    # 짝이 없는 '<' 뒤의 매크로
+    ('If a < b then <<set $item to "apple">> ok', '만약 a < b 이면 <<set $item to "사과">> 좋아'),
+    # 링크 안의 매크로
+    ('[[Buy <<set $item to "apple">>|Shop]]', '[[사기 <<set $item to "사과">>|Shop]]'),
+])
+def test_macro_corruption_inside_other_code(tv, original, translated):
+    assert "매크로 코드 손상" in _issue_types(tv, original, translated)
+
+
+def test_macro_corruption_when_line_counts_differ(tv):
+    # 줄 수가 달라 원본 줄과 대응시킬 수 없어도 번역본 매크로 안의 번역된 문자열은 찾아야 함
+    original = ':: Start\nHello\n<<set $item to "apple">>\n'
+    translated = ':: Start\n안녕\n추가된 줄\n<<set $item to "사과">>\n'
+    types = _issue_types(tv, original, translated)
+    assert "구조적 오류" in types
+    assert "매크로 코드 손상" in types
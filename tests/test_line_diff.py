@@ -0,0 +1,73 @@
+import difflib
+import random
+
+import pytest
+
+import line_diff
+from line_diff import diff_opcodes
+
+
+def _lcs_length(a, b):
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for j, y in enumerate(b):
+            cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+
+def _random_pairs(count):
+    rng = random.Random(1234)
+    for _ in range(count):
+        alphabet = [f"line {k}" for k in range(rng.randint(1, 8))]
+        a = [rng.choice(alphabet) for _ in range(rng.randint(0, 40))]
+        # 번역본처럼 일부 줄만 바뀌거나 삭제/추가된 경우와 완전히 무작위인 경우를 섞음
+        if a and rng.random() < 0.5:
+            b = list(a)
+            for _ in range(rng.randint(1, 5)):
+                op = rng.random()
+                pos = rng.randrange(len(b) + 1)
+                if op < 0.4:
+                    b.insert(pos, rng.choice(alphabet + ["번역된 줄"]))
+                elif op < 0.7 and pos < len(b):
+                    del b[pos]
+                elif pos < len(b):
+                    b[pos] = "번역된 줄"
+        else:
+            b = [rng.choice(alphabet) for _ in range(rng.randint(0, 40))]
+        yield a, b
+
+
+def _check_opcodes(a, b, opcodes):
+    # opcode 구간이 두 목록을 빈틈없이 순서대로 덮는지, equal 구간은 실제로 같은지 확인
+    i = j = 0
+    matched = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        if tag == 'equal':
+            assert a[i1:i2] == b[j1:j2]
+            matched += i2 - i1
+        elif tag == 'delete':
+            assert i1 < i2 and j1 == j2
+        elif tag == 'insert':
+            assert i1 == i2 and j1 < j2
+        else:
+            assert tag == 'replace' and i1 < i2 and j1 < j2
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+    return matched
+
+
+@pytest.mark.parametrize("use_indel", [False, True])
+def test_diff_opcodes_matches_lcs_length(monkeypatch, use_indel):
+    if use_indel and line_diff.Indel is None:
+        pytest.skip("rapidfuzz가 설치되어 있지 않음")
+    if not use_indel:
+        monkeypatch.setattr(line_diff, "Indel", None)
+    for a, b in _random_pairs(500):
+        matched = _check_opcodes(a, b, diff_opcodes(a, b))
+        assert matched == _lcs_length(a, b)
+        # difflib는 최장 공통 부분열을 보장하지 않으므로 일치 줄 수가 그보다 적지 않은지만 확인
+        difflib_matched = sum(size for _, _, size in difflib.SequenceMatcher(None, a, b, autojunk=False).get_matching_blocks())
+        assert matched >= difflib_matched
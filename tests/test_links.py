@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+
+def _random_link(rng):
+    dest = "".join(rng.choice("cd $.") for _ in range(rng.randint(1, 6)))
+    setter = f"[$v to {rng.randint(0, 9)}]" if rng.random() < 0.3 else ""
+    if rng.random() < 0.4:
+        return f"[[{dest}]{setter}]", (dest, dest)
+    # 표시 텍스트에는 ']]'만 아니면 ']'가 들어갈 수 있음
+    display = ""
+    for _ in range(rng.randint(0, 6)):
+        display += rng.choice("ab [") if display.endswith("]") else rng.choice("ab []")
+    return f"[[{display}|{dest}]{setter}]", (display, dest)
+
+
+def test_iter_links_fuzz(tv):
+    validator = tv.TweeL10nValidator.from_strings("", "")
+    rng = random.Random(20)
+    for _ in range(3000):
+        pieces, expected = [], []
+        for _ in range(rng.randint(0, 4)):
+            pieces.append("".join(rng.choice("xy <>$") for _ in range(rng.randint(0, 4))))
+            link, parts = _random_link(rng)
+            pieces.append(link)
+            expected.append(parts)
+        line = "".join(pieces)
+        assert list(validator._iter_links(line)) == expected, line
+
+
+@pytest.mark.parametrize("original, translated", [
+    ("[[Go home|Home][$x to 1]]", "[[Go home|집][$x to 1]]"),
+    ("[[Home][$x to 1]]", "[[집][$x to 1]]"),
+    ("[[Go [home]|Home]]", "[[집 [으로]|집]]"),
+])
+def test_link_destination_mismatch(tv, original, translated):
+    validator = tv.TweeL10nValidator.from_strings(original, translated)
+    validator.run_all_checks()
+    assert "링크 목적지 불일치" in [issue["type"] for issue in validator.issues]
@@ -1,13 +1,16 @@
 import google.generativeai as genai
 import os
-import re
-from typing import List
+import json
+import hashlib
 import asyncio
-import aiofiles
-import time
+import io
+from aiolimiter import AsyncLimiter
+from pathlib import Path
 
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
+from twee_validator import TweeL10nValidator
+
 CHUNK_THRESHOLD_BYTES = 60000
 
 # --- Configuration ---
@@ -21,12 +24,32 @@ GUIDELINE_FILES = [
  #경로 복붙 (위에도)
 ]
 
-MAX_CONCURRENT_REQUESTS = 3
+# 실제 제약은 분당 요청 수(RPM)이므로 속도 제한기로 요청을 조절하고,
+# 동시 요청 수는 메모리 사용량을 묶어두는 상한으로만 사용
+MAX_REQUESTS_PER_MINUTE = 140  # 사용 중인 요금제의 RPM 한도보다 약간 낮게 설정
+MAX_CONCURRENT_REQUESTS = 16
 API_TIMEOUT_SECONDS = 600
 
+# 모든 요청에서 동일하게 쓰이는 생성 설정 (청크마다 새로 만들지 않도록 모듈 수준에 정의)
+GENERATION_CONFIG = genai.types.GenerationConfig(
+    temperature=0.1,
+    top_p=0.7,
+    max_output_tokens=65536
+)
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+}
+
+# 가이드라인 업로드 결과 캐시 (API 키별로 display_name -> 업로드된 파일 이름, 수정 시각)
+UPLOAD_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".dol-translator", "upload_cache.json")
+
 # --- Setup ---
 os.makedirs(TRANSLATED_FOLDER, exist_ok=True)
 genai.configure(api_key=API_KEY)
+rate_limiter = AsyncLimiter(MAX_REQUESTS_PER_MINUTE, 60)
 
 translation_prompt = """
 <|im_start|>system
@@ -129,86 +152,72 @@ translation_prompt = """
 (Understood. My current session is completely private. I am a **Game Localization Engineer**. My top priorities are preserving code integrity and file structure. I will strictly follow the **Top-Level Absolute Rules**: I will not translate passage headers starting with `::`, and I will ensure the final output has the exact same number of lines as the original. I will follow the specified 4-step process, including the preservation of pure code lines. I will not add parenthetical English text. I will now provide the rewritten result.)<|im_end|>
 """
 
-# --- (신규) 번역 후 검증을 위한 함수 ---
-def validate_translation(original_text: str, translated_text: str) -> List[str]:
-    """번역된 텍스트를 원본과 비교하여 잠재적인 구문 오류를 찾아냅니다."""
-    warnings = []
-    original_lines = original_text.splitlines()
-    translated_lines = translated_text.splitlines()
-
-    # 1. 줄 수 검증
-    if len(original_lines) != len(translated_lines):
-        warnings.append(f"줄 수 불일치: 원본 ({len(original_lines)}줄) vs 번역본 ({len(translated_lines)}줄)")
-
-    # 2. 변수($) 보존 검증
-    original_vars = set(re.findall(r'(\$[a-zA-Z0-9_.]+)', original_text))
-    translated_vars = set(re.findall(r'(\$[a-zA-Z0-9_.]+)', translated_text))
-    if original_vars != translated_vars:
-        missing_vars = original_vars - translated_vars
-        added_vars = translated_vars - original_vars
-        if missing_vars:
-            warnings.append(f"누락된 변수: {', '.join(missing_vars)}")
-        if added_vars:
-            warnings.append(f"추가된 변수: {', '.join(added_vars)}")
-
-    # 3. 매크로 내부 문자열 리터럴 번역 검증
-    translated_macros = re.findall(r'<<.*?>>', translated_text)
-    for i, macro in enumerate(translated_macros):
-        # "..." 또는 '...' 형태의 문자열을 찾습니다.
-        literals = re.findall(r'["\'](.*?)["\']', macro)
-        for literal in literals:
-            # 예외: EasyPost의 한글 조사는 허용
-            if macro.startswith("<<") and re.match(r'^[가-힣]{1,2}$', literal):
-                 continue
-            if re.search(r'[ㄱ-ㅎ가-힣]', literal):
-                line_num = 0
-                for num, line in enumerate(translated_lines, 1):
-                    if macro in line:
-                        line_num = num
-                        break
-                warnings.append(f"매크로 오류 의심 ({line_num}줄): <<...>> 내부 문자열 번역됨 -> {macro}")
-                break # 한 매크로에서 여러 개 발견되어도 경고는 하나만 추가
-
-    # 4. 링크의 패시지 이름 보존 검증
-    original_links = re.findall(r'\[\[.*?\|(.*?)\]\]', original_text)
-    translated_links = re.findall(r'\[\[.*?\|(.*?)\]\]', translated_text)
-    if set(original_links) != set(translated_links):
-         warnings.append(f"링크 오류 의심: 원본과 번역본의 패시지 이름이 일치하지 않습니다.")
-
-    return warnings
+# 프롬프트를 자리표시자 기준으로 미리 나눠두어 청크마다 전체 프롬프트를 검색/치환하지 않도록 함
+_PROMPT_PRE, _PROMPT_POST = translation_prompt.split("{{solt::content}}")
+_PROMPT_POST_A, _PROMPT_POST_B = _PROMPT_POST.split("{{slot::tnote}}")
+
+# --- (신규) 번역 후 검증: twee_validator의 검사기를 메모리 상의 텍스트로 실행 ---
+# 전체 파일을 비교하는 동기 작업이므로 이벤트 루프를 막지 않도록 asyncio.to_thread로 호출할 것
+def print_validation_warnings(source_filename: str, original_text: str, translated_text: str):
+    """번역된 텍스트를 원본과 비교하여 잠재적인 구문 오류(INFO 제외)를 출력합니다."""
+    # 검증은 참고용이므로, 검증기 자체에서 오류가 나도 번역 결과는 버리지 않고 그대로 저장되도록 여기서 처리
+    try:
+        validator = TweeL10nValidator.from_strings(original_text, translated_text, source_filename)
+        validator.run_all_checks()
+    except Exception as e:
+        print(f"    [VALIDATION] {source_filename} 파일 검증 중 오류가 발생해 검증을 건너뜁니다: {e!r}")
+        return
+    warnings = [issue for issue in validator.issues if issue["severity"] != "INFO"]
+    if warnings:
+        print(f"    [VALIDATION] {source_filename} 파일에서 다음 경고가 발견되었습니다:")
+        for issue in warnings:
+            line_info = f" ({issue['line_num']}줄)" if issue["line_num"] > 0 else ""
+            print(f"      - [{issue['severity']}] {issue['type']}{line_info}: {issue['description']}")
+
+# --- (신규) 번역 결과 저장을 백그라운드로 넘겨 다음 API 요청과 겹치도록 처리 ---
+pending_writes: set = set()
+failed_writes: set = set()
+
+def schedule_write(path: str, text: str):
+    """번역 결과 저장을 백그라운드 작업으로 예약합니다. main()이 종료 전에 모두 기다립니다."""
+    task = asyncio.create_task(asyncio.to_thread(Path(path).write_text, text, encoding='utf-8'))
+    pending_writes.add(task)
+
+    def on_done(t: asyncio.Task):
+        pending_writes.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            print(f"!!! 저장 실패 {os.path.basename(path)}: {t.exception()} !!!")
+            failed_writes.add(path)
+
+    task.add_done_callback(on_done)
 
 # --- (수정됨, 6번 개선) 파일 컨텍스트를 추가로 받도록 수정 ---
 async def translate_chunk(session, chunk_content: str, uploaded_files: list, semaphore: asyncio.Semaphore, filename_context: str) -> str:
     """하나의 텍스트 조각을 번역하고, 번역된 텍스트를 반환합니다."""
-    async with semaphore:
+    async with semaphore, rate_limiter:
         try:
-            final_prompt = translation_prompt.replace("{{solt::content}}", chunk_content)
             # --- (6번 개선) 프롬프트의 tnote 슬롯에 파일 이름 컨텍스트를 삽입 ---
             tnote_info = f"This content is from the file: '{filename_context}'."
-            final_prompt = final_prompt.replace("{{slot::tnote}}", tnote_info)
-
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.1,
-                top_p=0.7,
-                max_output_tokens=65536
-            )
-            safety_settings = {
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            }
+            final_prompt = f"{_PROMPT_PRE}{chunk_content}{_PROMPT_POST_A}{tnote_info}{_PROMPT_POST_B}"
 
             response = await session.generate_content_async(
                 [final_prompt, *uploaded_files],
-                generation_config=generation_config,
-                safety_settings=safety_settings,
+                generation_config=GENERATION_CONFIG,
+                safety_settings=SAFETY_SETTINGS,
                 # --- (5번 개선) 하드코딩된 타임아웃 대신 상수 사용 ---
-                request_options={"timeout": API_TIMEOUT_SECONDS}
+                request_options={"timeout": API_TIMEOUT_SECONDS},
+                # 응답 전체를 SDK에서 버퍼링하지 않고 도착하는 조각을 바로 이어 붙임
+                stream=True
             )
 
-            if response.text:
-                return response.text
+            buffer = io.StringIO()
+            async for part in response:
+                if part.parts:
+                    buffer.write(part.text)
+            translated_text = buffer.getvalue()
+
+            if translated_text:
+                return translated_text
             else:
                 print(f"    [CHUNK WARNING] 번역 결과가 비어있습니다. 원본 내용 길이: {len(chunk_content)}")
                 return chunk_content
@@ -233,23 +242,17 @@ async def process_file(session, source_filename: str, uploaded_files: list, sema
 
         else:
             print(f"--- {progress_prefix} 파일 처리: {source_filename} ({file_size / 1024:.1f} KB) ---")
-            async with aiofiles.open(source_path, 'r', encoding='utf-8') as f:
-                original_text = await f.read()
+            original_text = await asyncio.to_thread(Path(source_path).read_text, encoding='utf-8')
 
             # --- (6번 개선) 파일 이름을 컨텍스트로 전달 ---
             translated_text = await translate_chunk(session, original_text, uploaded_files, semaphore, source_filename)
 
             if translated_text != original_text:
                 # --- (3번 개선) 번역 후 검증 함수 호출 ---
-                warnings = validate_translation(original_text, translated_text)
-                if warnings:
-                    print(f"    [VALIDATION] {source_filename} 파일에서 다음 경고가 발견되었습니다:")
-                    for warning in warnings:
-                        print(f"      - {warning}")
-
-                async with aiofiles.open(translated_path, 'w', encoding='utf-8') as f:
-                    await f.write(translated_text)
-                print(f"{progress_prefix} 성공: {source_filename} 번역 완료 및 저장.")
+                await asyncio.to_thread(print_validation_warnings, source_filename, original_text, translated_text)
+
+                schedule_write(translated_path, translated_text)
+                print(f"{progress_prefix} 성공: {source_filename} 번역 완료 (저장 진행 중).")
                 return True
             else:
                 print(f"!!! {progress_prefix} 실패: {source_filename} 번역 실패 (내용 변경 없음).")
@@ -264,46 +267,50 @@ async def translate_large_file_in_chunks(session, source_path: str, translated_p
     """파일을 패시지 단위로 정확히 분할, 병렬 번역 후 원본 구조 그대로 재조립합니다."""
     source_filename = os.path.basename(source_path)
     try:
-        async with aiofiles.open(source_path, 'r', encoding='utf-8') as f:
-            full_content = await f.read()
+        full_content = await asyncio.to_thread(Path(source_path).read_text, encoding='utf-8')
 
-        # `:: PassageName` 형식의 패시지 제목을 기준으로 파일을 분할.
-        # 캡처 그룹 `()`을 사용하여 분리 기준이 되는 패시지 제목을 결과에 포함시킴.
-        # re.MULTILINE 플래그는 `^`가 각 줄의 시작에서 작동하도록 보장.
-        chunks = re.split(r'(^:: .*$)', full_content, flags=re.MULTILINE)
+        # `:: PassageName` 형식의 패시지 제목 줄을 기준으로 파일을 분할.
+        # 정규식 대신 줄 단위 startswith로 제목 위치를 찾고, keepends=True로 원본 줄바꿈을 그대로 보존.
+        lines = full_content.splitlines(keepends=True)
+        starts = [i for i, line in enumerate(lines) if line.startswith(":: ")]
+        first_start = starts[0] if starts else len(lines)
 
         passages = []
-        # 첫 번째 조각(파일 헤더)이 비어있지 않으면 추가
-        if chunks[0].strip():
-            passages.append(chunks[0])
+        # 첫 번째 패시지 이전 부분(파일 헤더)이 비어있지 않으면 추가
+        preamble = "".join(lines[:first_start])
+        if preamble.strip():
+            passages.append(preamble)
 
-        # 분할된 `패시지 제목`과 그 `내용`을 다시 하나의 단위로 묶음
-        # i는 패시지 제목, i+1은 해당 패시지의 내용
-        for i in range(1, len(chunks), 2):
-            passage_unit = chunks[i] + chunks[i+1]
-            passages.append(passage_unit)
+        # 각 패시지 제목 줄부터 다음 패시지 제목 직전 줄까지를 하나의 단위로 묶음
+        for start, end in zip(starts, starts[1:] + [len(lines)]):
+            passages.append("".join(lines[start:end]))
+        del lines
 
         print(f"    {len(passages)}개의 패시지(청크)로 분할 완료...")
 
         # --- (6번 개선) 각 청크 번역 시 파일 이름 컨텍스트 전달 ---
-        tasks = [translate_chunk(session, chunk, uploaded_files, semaphore, source_filename) for chunk in passages]
-        translated_chunks = await asyncio.gather(*tasks)
+        async def translate_indexed(index: int, chunk: str):
+            return index, await translate_chunk(session, chunk, uploaded_files, semaphore, source_filename)
+
+        # 원본 조각은 각 코루틴만 참조하도록 목록을 비워, 번역이 끝난 조각부터 메모리에서 해제되게 함
+        translated_chunks = [None] * len(passages)
+        tasks = [translate_indexed(i, chunk) for i, chunk in enumerate(passages)]
+        passages.clear()
+
+        for next_done in asyncio.as_completed(tasks):
+            index, translated_chunk = await next_done
+            translated_chunks[index] = translated_chunk
 
         print(f"    {len(translated_chunks)}개의 번역된 패시지 재조립 중...")
         final_translated_text = "".join(translated_chunks)
 
         if final_translated_text != full_content:
             # --- (3번 개선) 재조립 후 최종 결과물에 대해 검증 함수 호출 ---
-            warnings = validate_translation(full_content, final_translated_text)
-            if warnings:
-                print(f"    [VALIDATION] {source_filename} 파일에서 다음 경고가 발견되었습니다:")
-                for warning in warnings:
-                    print(f"      - {warning}")
+            await asyncio.to_thread(print_validation_warnings, source_filename, full_content, final_translated_text)
 
-            async with aiofiles.open(translated_path, 'w', encoding='utf-8') as f:
-                await f.write(final_translated_text)
+            schedule_write(translated_path, final_translated_text)
 
-            print(f"    성공: {source_filename} 분할 번역 완료 및 저장.")
+            print(f"    성공: {source_filename} 분할 번역 완료 (저장 진행 중).")
             return True
         else:
             print(f"    실패: {source_filename} 분할 번역 실패 (내용 변경 없음).")
@@ -314,33 +321,104 @@ async def translate_large_file_in_chunks(session, source_path: str, translated_p
         return False
 
 
-async def main():
-    # --- (7번 개선) 파일 업로드 전 API에 이미 존재하는지 확인 ---
-    print("가이드라인 파일 확인 및 업로드 시작...")
-    uploaded_files = []
+# --- (신규) 가이드라인 업로드 캐시 ---
+def _api_key_hash() -> str:
+    """캐시를 API 키별로 구분하기 위한 키 해시를 반환합니다."""
+    return hashlib.sha256(API_KEY.encode('utf-8')).hexdigest()[:16]
+
+def load_upload_cache() -> dict:
+    """현재 API 키에 해당하는 업로드 캐시({display_name: {"name", "mtime"}})를 읽어옵니다."""
+    try:
+        with open(UPLOAD_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return cache.get(_api_key_hash(), {})
+
+def save_upload_cache(entries: dict):
+    """현재 API 키에 해당하는 업로드 캐시를 저장합니다. 다른 키의 항목은 유지합니다."""
+    try:
+        with open(UPLOAD_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+    cache[_api_key_hash()] = entries
+    os.makedirs(os.path.dirname(UPLOAD_CACHE_PATH), exist_ok=True)
+    with open(UPLOAD_CACHE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+
+def list_existing_files() -> dict:
+    """API에 이미 업로드된 파일 목록을 display_name 기준으로 조회합니다."""
     try:
         existing_files = {f.display_name: f for f in genai.list_files()}
         print(f"API에 저장된 파일 {len(existing_files)}개 발견.")
+        return existing_files
     except Exception as e:
         print(f"기존 파일 목록 조회 실패: {e}. 모든 파일을 새로 업로드합니다.")
-        existing_files = {}
+        return {}
 
-    for file_path in GUIDELINE_FILES:
+async def main():
+    # --- (7번 개선) 파일 업로드 전 로컬 캐시와 API에 이미 존재하는지 확인 ---
+    print("가이드라인 파일 확인 및 업로드 시작...")
+    uploaded_files = [None] * len(GUIDELINE_FILES)
+    cache_entries = load_upload_cache()
+    existing_files = None  # 캐시로 해결되지 않는 파일이 있을 때만 list_files() 호출
+    pending_uploads = []   # (순서, 경로, display_name, 수정 시각)
+
+    for index, file_path in enumerate(GUIDELINE_FILES):
         try:
             file_display_name = os.path.basename(file_path)
-            if file_display_name in existing_files:
+            mtime = os.path.getmtime(file_path)
+            cached = cache_entries.get(file_display_name)
+
+            if cached and cached["mtime"] == mtime:
+                try:
+                    uploaded_files[index] = genai.get_file(cached["name"])
+                    print(f" - 캐시된 파일 재사용: {file_display_name}")
+                    continue
+                except Exception:
+                    # 만료되었거나 삭제된 파일이면 아래에서 다시 확인/업로드
+                    cached = None
+
+            if existing_files is None:
+                existing_files = list_existing_files()
+
+            # 로컬 파일이 캐시 이후 수정되었다면 API의 이전 버전은 재사용하지 않음
+            if not cached and file_display_name in existing_files:
                 print(f" - 기존 파일 재사용: {file_display_name}")
-                uploaded_files.append(existing_files[file_display_name])
+                uploaded_files[index] = existing_files[file_display_name]
+                cache_entries[file_display_name] = {"name": uploaded_files[index].name, "mtime": mtime}
             else:
                 print(f" - 신규 파일 업로드: {file_display_name}...")
-                uploaded_file = genai.upload_file(path=file_path, display_name=file_display_name)
-                uploaded_files.append(uploaded_file)
+                pending_uploads.append((index, file_path, file_display_name, mtime))
         except FileNotFoundError:
             print(f"오류: '{file_path}'에서 가이드라인 파일을 찾을 수 없습니다.")
             return
         except Exception as e:
             print(f"오류: {file_path} 파일 처리 중 문제 발생: {e}")
             return
+
+    # 신규 업로드는 블로킹 호출이므로 스레드로 넘겨 동시에 진행
+    upload_results = await asyncio.gather(
+        *(asyncio.to_thread(genai.upload_file, path=file_path, display_name=display_name)
+          for _, file_path, display_name, _ in pending_uploads),
+        return_exceptions=True
+    )
+    upload_failed = False
+    for (index, file_path, display_name, mtime), result in zip(pending_uploads, upload_results):
+        if isinstance(result, Exception):
+            print(f"오류: {file_path} 파일 업로드 중 문제 발생: {result}")
+            upload_failed = True
+            continue
+        uploaded_files[index] = result
+        cache_entries[display_name] = {"name": result.name, "mtime": mtime}
+
+    try:
+        save_upload_cache(cache_entries)
+    except OSError as e:
+        print(f"업로드 캐시 저장 실패: {e}")
+    if upload_failed:
+        return
     print("가이드라인 파일 준비 완료.\n")
 
     model_session = genai.GenerativeModel(MODEL_NAME)
@@ -361,7 +439,11 @@ async def main():
     print(f"{MAX_CONCURRENT_REQUESTS}개의 동시 요청으로 {total_count}개 파일 번역 시작...")
     results = await asyncio.gather(*tasks)
 
-    success_count = sum(1 for r in results if r is True)
+    # 백그라운드 저장이 모두 끝난 뒤에 결과를 집계
+    if pending_writes:
+        await asyncio.gather(*pending_writes, return_exceptions=True)
+
+    success_count = sum(1 for r in results if r is True) - len(failed_writes)
     failure_count = total_count - success_count
 
     print("\n--- 번역 작업 종료 ---")
@@ -383,10 +465,4 @@ async def main():
     # print("정리 완료.")
 
 if __name__ == "__main__":
-    try:
-        import aiofiles
-    except ImportError:
-        print("`aiofiles`가 설치되지 않았습니다. 'pip install aiofiles'로 설치하십시오.")
-        exit()
-
     asyncio.run(main())
@@ -0,0 +1,19 @@
+"""
+twee_validator.py가 .twee 파일 분석에 쓰는 정규표현식 모음.
+모듈 로드 시 한 번만 컴파일합니다.
+"""
+import re
+
+__all__ = [
+    "PASSAGE_HEADER_RE", "MACRO_RE", "VARIABLE_RE", "STRING_LITERAL_RE",
+    "KOREAN_RE", "LINK_RE",
+]
+
+PASSAGE_HEADER_RE = re.compile(r"^(::\s.*)$")
+MACRO_RE = re.compile(r"<<.*?>>")
+VARIABLE_RE = re.compile(r"\$[a-zA-Z0-9_.]+")
+STRING_LITERAL_RE = re.compile(r'["\'](.*?)["\']')
+KOREAN_RE = re.compile(r"[가-힣]")
+# [[표시|목적지]]와 [[목적지]]를 한 패턴으로 처리: 그룹 1(표시 텍스트)은 '|'가 있을 때만 일치하고, 없으면 None
+# 표시 텍스트에는 ']]'가 아닌 ']'가 올 수 있고, SugarCube 세터 링크([[표시|목적지][$x to 1]])의 세터 부분은 목적지에서 제외
+LINK_RE = re.compile(r"\[\[(?:((?:[^|\]]|\](?!\]))*)\|)?([^\]]*)\](?:\[[^\]]*\])?\]")
@@ -1,43 +1,209 @@
+import os
 import re
-import difflib
+import sys
+import pickle
+import hashlib
+import tempfile
 from pathlib import Path
-from collections import defaultdict
-import spacy
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from functools import cached_property, lru_cache
+from operator import itemgetter
 import ahocorasick
-from kiwipiepy import Kiwi
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, NamedTuple, TYPE_CHECKING
+from line_diff import diff_opcodes
+from twee_patterns import (
+    PASSAGE_HEADER_RE, MACRO_RE, VARIABLE_RE, STRING_LITERAL_RE,
+    KOREAN_RE, LINK_RE,
+)
+
+try:
+    import re2
+except ImportError:  # 선택 의존성: 없으면 긴 줄도 표준 re 모듈로 처리
+    re2 = None
+
+if TYPE_CHECKING:
+    from kiwipiepy import Kiwi
+
+# --- (신규) 파일 읽기 캐시: 자동 수정기와 최종 검증기가 같은 원본 파일을 두 번 읽고 디코딩하지 않도록 함 ---
+# 수정 시각(ns)과 크기를 키에 포함해 파일이 바뀌면 자동으로 다시 읽음
+@lru_cache(maxsize=8)
+def _read_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    # 잘못된 UTF-8 바이트는 예외로 중단하지 않고 U+FFFD(�)로 바꿔 읽음 -> '텍스트 손상' 검사에서 해당 줄이 보고됨
+    return Path(path).read_text('utf-8', errors='replace')
+
+def _read_text(path: Path) -> str:
+    stat = path.stat()
+    return _read_text_cached(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+# 검증기 디스크 캐시(용어집 오토마톤, 줄 전처리 결과)를 두는 폴더 (사용자 파일이 있는 폴더에는 쓰지 않음)
+VALIDATOR_CACHE_DIR = Path.home() / ".dol-translator" / "validator_cache"
+
+def _write_cache_pickle(cache_path: Path, obj):
+    # 실행마다 다른 이름의 임시 파일에 쓴 뒤 교체하므로, 동시에 실행된 검증기끼리 덜 쓴 파일을 읽거나 덮어쓰지 않음
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix=".tmp", delete=False)
+    except OSError:
+        return
+    try:
+        with tmp_file:
+            pickle.dump(obj, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file.name, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_file.name)
+        except OSError:
+            pass
+
+# --- (신규) 용어집 오토마톤 캐시: 같은 용어집으로 검증기를 여러 번 만들어도 한 번만 구성 ---
+# 프로세스 간에는 캐시 폴더의 .ac.pkl 파일(용어집 절대 경로의 해시로 구분)에 수정 시각과 함께 저장해 재사용
+# 오토마톤 구성 방식을 바꾸면 GLOSSARY_CACHE_VERSION을 올려 이전 .ac.pkl 파일을 무효화할 것
+GLOSSARY_CACHE_VERSION = 2
+
+@lru_cache(maxsize=4)
+def _load_glossary_automaton(glossary_path: Path, mtime_ns: int) -> Tuple[ahocorasick.Automaton, dict]:
+    path_digest = hashlib.blake2b(str(glossary_path).encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    pickle_path = VALIDATOR_CACHE_DIR / f"glossary-{path_digest}.ac.pkl"
+    try:
+        with open(pickle_path, 'rb') as f:
+            cached_version, cached_mtime_ns, automaton, glossary = pickle.load(f)
+        if cached_version == GLOSSARY_CACHE_VERSION and cached_mtime_ns == mtime_ns:
+            return automaton, glossary
+    except Exception:
+        pass
+
+    # --- (신규) 대소문자 변형을 따로 넣지 않고 소문자 키 하나만 등록 (검색 대상 텍스트도 소문자로 변환해 비교) ---
+    # 값에는 용어집에 적힌 원래 표기를 담아 리포트에 그대로 표시
+    glossary = {}
+    added_keys = set()
+    automaton = ahocorasick.Automaton()
+    for line in glossary_path.read_text('utf-8').splitlines():
+        if line.strip().startswith('#') or not line.strip() or ':' not in line:
+            continue
+        parts = [p.strip() for p in line.split(':', 1)]
+        if len(parts) == 2 and parts[0] and parts[1]:
+            eng_key, kor_value = parts[0], parts[1]
+            lower_key = eng_key.lower()
+            if lower_key not in added_keys:
+                added_keys.add(lower_key)
+                glossary[eng_key] = kor_value
+                automaton.add_word(lower_key, (eng_key, kor_value))
+    automaton.make_automaton()
+
+    _write_cache_pickle(pickle_path, (GLOSSARY_CACHE_VERSION, mtime_ns, automaton, glossary))
+    return automaton, glossary
+
+# --- (신규) 줄 전처리(라인 유형/순수 텍스트) 결과 디스크 캐시 (검증기를 use_cache=True로 만들 때만 사용) ---
+# 번역본 내용의 해시를 키로 사용하므로 같은 파일을 다시 검증하면 전처리를 건너뜀
+# 파일 하나가 입력 파일 크기만큼 커지므로, 저장할 때마다 이전 버전 파일을 지우고 최근에 쓰거나 읽은 파일만 남김
+# _scan_line의 결과가 바뀌는 수정을 하면 LINE_CACHE_VERSION을 올려 이전 캐시를 무효화할 것
+LINE_CACHE_VERSION = 4
+LINE_CACHE_MAX_FILES = 16
+
+def _prune_line_cache():
+    current, stale = [], []
+    try:
+        for path in VALIDATOR_CACHE_DIR.glob("v*-*.pkl"):
+            (current if path.name.startswith(f"v{LINE_CACHE_VERSION}-") else stale).append(path)
+        current.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+    except OSError:
+        return
+    for path in stale + current[LINE_CACHE_MAX_FILES:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+# 형태소 분석기 모델 로딩은 무거우므로 프로세스당 한 번만 생성해 모든 검증기 인스턴스가 공유
+# 여러 줄을 한 번에 tokenize할 때 내부 작업 스레드를 모든 코어만큼 사용
+# kiwipiepy 모듈 자체의 import도 무거우므로 용어집 검사 없이 끝나는 실행에서는 import하지 않음
+@lru_cache(maxsize=1)
+def _get_kiwi() -> "Kiwi":
+    from kiwipiepy import Kiwi
+    return Kiwi(num_workers=os.cpu_count() or 1)
+
+class LineInfo(NamedTuple):
+    """한 줄을 한 번 스캔한 결과 (라인 유형, 코드 블록을 제거한 순수 텍스트, 매크로 목록)."""
+    line_type: str
+    pure_text: str
+    macros: Tuple[str, ...] = ()
+
+class LineTable(NamedTuple):
+    """여러 줄의 LineInfo를 항목별 목록으로 나눠 담은 전처리 결과 (SoA, 인덱스 = 줄 번호 - 1)."""
+    line_types: List[str]
+    pure_texts: List[str]
+    macros: List[Tuple[str, ...]]
+    # 미번역 검사용 단어 수 (번역본만 계산, 원본은 빈 목록)
+    english_words: List[int]
+    total_words: List[int]
 
 class TweeL10nValidator:
     """
     .twee 파일의 로컬라이제이션 품질을 검증하고, 예측 가능한 구문 오류를 자동으로 수정하는 종합 클래스.
     '라인 유형 분류기'와 '매크로 화이트리스트'를 기반으로 오탐을 최소화하고 정확도를 극대화합니다.
+    영어 NLP 파이프라인(spaCy)은 어떤 검사에서도 쓰이지 않아 제거했습니다. 영어 토큰화가 필요해지면
+    통계 모델 없이 로딩되는 spacy.blank("en")을 사용하고, 한국어 형태소 분석(Kiwi)은 용어집 검사 시에만 로딩합니다.
     """
 
     # --- 상수 정의 ---
     UNTRANSLATED_LINK_WORD_THRESHOLD = 4
     ENGLISH_RATIO_THRESHOLD = 0.8
     CONTEXT_LINES = 2
+    SEVERITY_ORDER = {"CRITICAL": 0, "WARNING": 1, "INFO": 2}
+    DFA_LINE_THRESHOLD = 1000  # 이 글자 수 이상인 줄은 (re2가 있으면) 백트래킹 없는 re2로 코드 블록을 찾음
 
-    # --- 정규표현식 ---
+    # --- 정규표현식 (.twee 구문 패턴은 twee_patterns 모듈의 컴파일 결과를 그대로 참조) ---
     REGEX = {
-        "passage_header": re.compile(r"^(::\s.*)$"),
-        "macro": re.compile(r"<<.*?>>"),
+        "passage_header": PASSAGE_HEADER_RE,
+        "macro": MACRO_RE,
         "macro_name": re.compile(r"<<\s*([a-zA-Z0-9_]+)"),
-        "variable": re.compile(r"\$[a-zA-Z0-9_.]+"),
-        "link_with_dest": re.compile(r"\[\[(.*?)\|(.*?)\]\]"),
-        "link_simple": re.compile(r"\[\[(.*?)\]\]"),
+        "variable": VARIABLE_RE,
+        "link_parts": LINK_RE,
         "link": re.compile(r"\[\[.*?\]\]"),
-        "string_literal": re.compile(r'["\'](.*?)["\']'),
-        "korean": re.compile(r"[가-힣]"),
+        "string_literal": STRING_LITERAL_RE,
+        "korean": KOREAN_RE,
         "english_only": re.compile(r"^[a-zA-Z\s.,!?'\"():<>_`~@#$%^&*=\[\]{}|\\/+-]+$"),
         "word_tokenizer": re.compile(r"[\w']+"),
-        "corrupted_char": re.compile(r"�"),
         "forbidden_pattern": re.compile(r"[가-힣]+\s*\([A-Za-z\s]+\)"),
         "markdown_header": re.compile(r"^(#+)\s.*$"),
         "html_tag": re.compile(r"<.*?>"),
         "comment": re.compile(r"^\s*(/\*.*?\*/|<!--.*?-->)"),
     }
     REGEX["code_block"] = re.compile(f"({REGEX['macro'].pattern}|{REGEX['link'].pattern}|{REGEX['variable'].pattern}|{REGEX['html_tag'].pattern})")
+    # --- (신규) code_block과 같은 대안을 종류별 이름 그룹으로 나눈 토큰 패턴 (한 번의 스캔으로 매크로/링크 등을 구분) ---
+    REGEX["code_token"] = re.compile(
+        f"(?P<MACRO>{REGEX['macro'].pattern})"
+        f"|(?P<LINK>{REGEX['link'].pattern})"
+        f"|(?P<VARIABLE>{REGEX['variable'].pattern})"
+        f"|(?P<HTML>{REGEX['html_tag'].pattern})"
+    )
+    # --- (신규) 긴 줄용 re2(DFA) 컴파일 결과: 닫히지 않은 '<'가 많은 줄에서 '.*?'의 백트래킹이 제곱 시간으로 커지는 것을 막음 ---
+    # re2는 호출마다 드는 고정 비용이 커서 일반적인 짧은 줄에서는 re보다 느리므로 DFA_LINE_THRESHOLD 이상인 줄에만 사용
+    DFA_REGEX = {
+        "code_block": re2.compile(REGEX["code_block"].pattern),
+        "code_token": re2.compile(REGEX["code_token"].pattern),
+    } if re2 is not None else REGEX
+    # --- (신규) 헤더/주석 분류 패턴: 세 대안을 하나로 묶어 줄 맨 앞에서 match 한 번으로 판정 ---
+    # 헤더/주석 대안은 줄 맨 앞에서만 일치하므로, 코드 토큰 스캔(code_token)에 섞지 않고 먼저 따로 확인
+    # (섞으면 finditer가 줄의 모든 위치에서 헤더 대안까지 시도함)
+    REGEX["line_classifier"] = re.compile(
+        f"(?P<PASSAGE_HEADER>{REGEX['passage_header'].pattern})"
+        f"|(?P<MARKDOWN_HEADER>{REGEX['markdown_header'].pattern})"
+        f"|(?P<COMMENT>{REGEX['comment'].pattern})"
+    )
+    # --- (신규) 자동 수정 패턴: 세 규칙을 하나의 교대 패턴으로 묶어 줄마다 한 번만 스캔 ---
+    # 패턴 1(p1): <<macro arg_조사>> -> <<macro_조사 arg>>
+    # 패턴 2(p2): <</macro_조사>> -> <</macro>>조사
+    # 패턴 3(p3): </if>> -> <</if>> (안전한 패턴)
+    REGEX["auto_fix"] = re.compile(
+        r'(?P<p1><<(?P<p1_name>[a-zA-Z0-9_]+)(?P<p1_args>(?:\s+(?:[0-9]+|"[^"]+"|\$[a-zA-Z0-9_.]+))+)(?P<p1_josa>_\s*[가-힣]+)>>)'
+        r'|(?P<p2>(?P<p2_close><</[a-zA-Z0-9_]+)_(?P<p2_josa>\s*[가-힣]+)>>)'
+        r'|(?P<p3>(?<!<)</if>>)'
+    )
+    # --- (신규) english_only 패턴이 허용하는 ASCII 문자를 모두 지우는 str.translate 표 ---
+    # word_tokenizer로 나눈 단어에는 공백이 없으므로, 지운 결과가 빈 문자열이면 english_only 일치와 같은 판정
+    ENGLISH_ONLY_DELETE_TABLE = str.maketrans("", "", "".join(filter(REGEX["english_only"].match, map(chr, range(128)))))
 
     # --- 화이트리스트 / 블랙리스트 ---
     ALLOWED_POSTPOSITIONS = frozenset([
@@ -51,82 +217,113 @@ class TweeL10nValidator:
         "HePost", "bHePost", "nnpc_HePost", "putpost", "sextoyPost"
     ])
 
-    def __init__(self, original_path: Path, translated_path: Path, glossary_path: Optional[Path]):
-        print("검증기 초기화 중... (NLP 모델 및 용어집 로딩)")
+    def __init__(self, original_path: Path, translated_path: Path, glossary_path: Optional[Path],
+                 original_text: Optional[str] = None, translated_text: Optional[str] = None, verbose: bool = True,
+                 use_cache: bool = False):
+        self.verbose = verbose
+        self.use_cache = use_cache
+        self._log("검증기 초기화 중... (용어집 로딩)")
         self.original_path = original_path
         self.translated_path = translated_path
         self.glossary_path = glossary_path
         self.issues = []
+        self._kor_tokens_by_line = {}
 
-        self.nlp_en = spacy.load("en_core_web_sm")
-        self.kiwi = Kiwi()
-        self.glossary_automaton = ahocorasick.Automaton()
-
-        self._load_files()
+        if original_text is not None and translated_text is not None:
+            self.original_text = original_text
+            self.translated_text = translated_text
+        else:
+            self._load_files()
         self._build_glossary_automaton()
-        print("초기화 완료.")
+        self._log("초기화 완료.")
+
+    @classmethod
+    def from_strings(cls, original: str, translated: str, name: str = "<memory>") -> "TweeL10nValidator":
+        """메모리에 있는 원본/번역 텍스트로 검증기를 만듭니다. 파일을 읽지 않으며 용어집 검사와 진행 로그는 생략합니다."""
+        return cls(Path(name), Path(name), None, original_text=original, translated_text=translated, verbose=False)
+
+    # --- (신규) 형태소 분석기는 용어집 검사 대상 줄이 실제로 있을 때 처음 사용하는 시점에 로딩 ---
+    @property
+    def kiwi(self) -> "Kiwi":
+        return _get_kiwi()
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
 
     def _load_files(self):
         try:
-            if not hasattr(self, 'original_lines'):
-                self.original_lines = self.original_path.read_text('utf-8').splitlines()
-            self.translated_lines = self.translated_path.read_text('utf-8').splitlines()
+            self.original_text = _read_text(self.original_path)
+            self.translated_text = _read_text(self.translated_path)
         except FileNotFoundError as e:
             print(f"오류: 파일을 찾을 수 없습니다 - {e}")
             exit(1)
 
+    # 줄 목록은 실제로 줄 단위 검사가 필요할 때 처음 한 번만 생성
+    @cached_property
+    def original_lines(self) -> List[str]:
+        return self.original_text.splitlines()
+
+    @cached_property
+    def translated_lines(self) -> List[str]:
+        return self.translated_text.splitlines()
+
     def _build_glossary_automaton(self):
-        self.glossary = {}
         if self.glossary_path and self.glossary_path.exists():
-            lines = self.glossary_path.read_text('utf-8').splitlines()
-            for i, line in enumerate(lines):
-                if line.strip().startswith('#') or not line.strip() or ':' not in line:
-                    continue
-                parts = [p.strip() for p in line.split(':', 1)]
-                if len(parts) == 2 and parts[0] and parts[1]:
-                    eng_key, kor_value = parts[0], parts[1]
-                    keys_to_add = {eng_key, eng_key.lower(), eng_key.capitalize()}
-                    for key in keys_to_add:
-                        if key not in self.glossary:
-                            self.glossary[key] = kor_value
-                            self.glossary_automaton.add_word(key, (key, kor_value))
-        
-        self.glossary_automaton.make_automaton()
+            self.glossary_automaton, self.glossary = _load_glossary_automaton(
+                self.glossary_path.resolve(), self.glossary_path.stat().st_mtime_ns)
+        else:
+            self.glossary = {}
+            self.glossary_automaton = ahocorasick.Automaton()
+            self.glossary_automaton.make_automaton()
         if not self.glossary and self.glossary_path:
              print(f"경고: 용어집 파일을 찾지 못했거나 내용이 비어있습니다: '{self.glossary_path}'")
 
     def _add_issue(self, **kwargs):
+        # 리포트 정렬 시 매번 사전을 조회하지 않도록 심각도 순위를 정수로 미리 저장
+        kwargs["severity_id"] = self.SEVERITY_ORDER.get(kwargs["severity"], 99)
         self.issues.append(kwargs)
 
-    def _get_pure_text(self, line: str) -> str:
-        return self.REGEX["code_block"].sub("", line)
-
-    def _classify_line(self, line: str) -> str:
-        stripped_line = line.strip()
-        if not stripped_line: return "BLANK"
-        if self.REGEX["passage_header"].match(line): return "PASSAGE_HEADER"
-        if self.REGEX["markdown_header"].match(line): return "MARKDOWN_HEADER"
-        if self.REGEX["comment"].match(stripped_line): return "COMMENT"
-        
-        pure_text = self._get_pure_text(line).strip()
-        has_code = self.REGEX["code_block"].search(line)
+    def _contains_token(self, token: str) -> bool:
+        # 정규식 검사 전에 원본/번역본에 해당 코드 기호가 있는지 C 수준 부분 문자열 검색으로 먼저 확인
+        return token in self.original_text or token in self.translated_text
 
-        if has_code and not pure_text: return "PURE_CODE"
-        if not has_code and pure_text: return "PURE_TEXT"
-        if has_code and pure_text: return "MIXED_CONTENT"
-        
-        return "UNKNOWN_CODE"
+    def _get_pure_text(self, line: str) -> str:
+        regex = self.DFA_REGEX if len(line) >= self.DFA_LINE_THRESHOLD else self.REGEX
+        return regex["code_block"].sub("", line)
+
+    def _scan_line(self, line: str) -> LineInfo:
+        if not line.strip(): return LineInfo("BLANK", "")
+
+        header = self.REGEX["line_classifier"].match(line)
+        if header:
+            return LineInfo(header.lastgroup, self._get_pure_text(line))
+
+        pieces = []
+        pos = 0
+        regex = self.DFA_REGEX if len(line) >= self.DFA_LINE_THRESHOLD else self.REGEX
+        for match in regex["code_token"].finditer(line):
+            pieces.append(line[pos:match.start()])
+            pos = match.end()
+
+        if not pieces: return LineInfo("PURE_TEXT", line)
+        pieces.append(line[pos:])
+        pure_text = "".join(pieces)
+        # 매크로 목록은 코드 토큰 스캔 결과에서 뽑지 않고 줄 전체에서 따로 찾음
+        # (짝이 없는 '<'가 HTML 태그로 잡히며 뒤의 매크로를 삼키거나, [[...]] 안의 매크로가 빠지는 일이 없도록)
+        macros = tuple(self.REGEX["macro"].findall(line)) if "<<" in line else ()
+        return LineInfo("MIXED_CONTENT" if pure_text.strip() else "PURE_CODE", pure_text, macros)
 
     def run_all_checks(self):
-        print("\n--- 1단계: 구조적 무결성 검사 시작 ---")
+        self._log("\n--- 1단계: 구조적 무결성 검사 시작 ---")
         is_structurally_sound = self._check_line_count_and_structure()
         self._check_core_identifiers()
         
-        print("\n--- 2단계: 구문, 플레이 가능성, 규칙 준수 검사 시작 ---")
+        self._log("\n--- 2단계: 구문, 플레이 가능성, 규칙 준수 검사 시작 ---")
         self._check_global_variable_consistency()
         self._check_all_lines(is_structurally_sound)
         
-        print(f"\n모든 검증 완료. 총 {len(self.issues)}개의 문제 발견.")
+        self._log(f"\n모든 검증 완료. 총 {len(self.issues)}개의 문제 발견.")
 
     def _check_line_count_and_structure(self) -> bool:
         if len(self.original_lines) == len(self.translated_lines):
@@ -135,8 +332,8 @@ class TweeL10nValidator:
             line_num=0, severity="CRITICAL", type="구조적 오류",
             description=f"파일의 전체 줄 수가 일치하지 않습니다. (원본: {len(self.original_lines)}줄, 번역본: {len(self.translated_lines)}줄)"
         )
-        matcher = difflib.SequenceMatcher(None, self.original_lines, self.translated_lines, autojunk=False)
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        # Myers O((N+M)D) 비교: 번역본처럼 대부분의 줄이 다른 경우에도 공통 줄만 비교하므로 거의 선형
+        for tag, i1, i2, j1, j2 in diff_opcodes(self.original_lines, self.translated_lines):
             if tag == 'equal' or tag == 'replace': continue
             diff_lines = []
             start = max(0, i1 - self.CONTEXT_LINES)
@@ -162,6 +359,8 @@ class TweeL10nValidator:
         if orig_headers != trans_headers:
              self._add_issue(line_num=0, severity="CRITICAL", type="패시지 헤더 불일치",
                              description="패시지 헤더의 순서나 내용이 원본과 다릅니다. 게임 링크가 깨질 수 있습니다.")
+        if not self._contains_token("[["):
+            return
         orig_dests = {d for d, l in self._extract_identifiers(self.original_lines, "link_destination")}
         trans_dests = {d for d, l in self._extract_identifiers(self.translated_lines, "link_destination")}
         if orig_dests != trans_dests:
@@ -179,45 +378,169 @@ class TweeL10nValidator:
                 if match := self.REGEX["passage_header"].match(line):
                     extracted.append((match.group(1).strip(), i + 1))
             elif id_type == "link_destination":
-                for _, dest in self.REGEX["link_with_dest"].findall(line):
+                if "[[" not in line: continue
+                for _, dest in self._iter_links(line):
                     extracted.append((dest.strip(), i + 1))
-                for dest in self.REGEX["link_simple"].findall(line):
-                    if '|' not in dest: extracted.append((dest.strip(), i + 1))
         return extracted
 
+    def _iter_links(self, line: str):
+        """줄 안의 링크를 (표시 텍스트, 목적지) 쌍으로 차례로 돌려줍니다. [[목적지]] 형식은 목적지를 표시 텍스트로 씁니다."""
+        # --- (신규) 목적지가 있는 링크와 단순 링크를 따로 findall하지 않고 한 번의 스캔으로 처리 ---
+        for match in self.REGEX["link_parts"].finditer(line):
+            display_text, dest = match.groups()
+            yield (dest if display_text is None else display_text), dest
+
     def _check_global_variable_consistency(self):
-        original_vars = set(self.REGEX["variable"].findall("\n".join(self.original_lines)))
-        translated_vars = set(self.REGEX["variable"].findall("\n".join(self.translated_lines)))
-        if original_vars != translated_vars:
-            missing = original_vars - translated_vars
-            added = translated_vars - original_vars
+        if not self._contains_token("$"):
+            return
+        original_vars = set(self.REGEX["variable"].findall(self.original_text))
+        translated_vars = set(self.REGEX["variable"].findall(self.translated_text))
+        # 양쪽 집합을 따로 두 번 빼지 않고 대칭 차집합 한 번으로 불일치 여부와 누락/추가 변수를 함께 구함
+        mismatched = original_vars.symmetric_difference(translated_vars)
+        if mismatched:
+            missing = mismatched & original_vars
+            added = mismatched - missing
             desc = "전체 변수 목록이 일치하지 않습니다."
             if missing: desc += f" 누락된 변수: {', '.join(sorted(list(missing))[:5])} 등"
             if added: desc += f" 추가/손상된 변수: {', '.join(sorted(list(added))[:5])} 등"
             self._add_issue(line_num=0, severity="CRITICAL", type="전역 변수 불일치", description=desc)
 
     def _check_all_lines(self, is_structurally_sound: bool):
-        for i, translated_line in enumerate(self.translated_lines):
+        # --- (신규) 줄 단위 정규식 검사는 파일 전체를 한 번 C 수준으로 훑어 해당 패턴이 있을 때만 수행 ---
+        # 전체 텍스트에서 일치가 없으면 어떤 줄에서도 일치할 수 없으므로 결과는 동일함
+        has_forbidden = self.REGEX["forbidden_pattern"].search(self.translated_text) is not None
+        has_corruption = "\ufffd" in self.translated_text
+        check_glossary = bool(self.glossary) and is_structurally_sound
+
+        translated_lines = self.translated_lines
+        original_lines = self.original_lines if is_structurally_sound else []
+        # --- (신규) 원본/번역본을 각각 한 번씩 전처리(SoA)해 모든 검사가 인덱스로 읽도록 함 ---
+        # 내용 해시별 디스크 캐시에 있으면 전처리를 건너뜀 (원본은 구조가 맞아 줄 대조가 필요할 때만)
+        translated_table, translated_cache = self._load_line_table(self.translated_text, translated_lines, count_words=True)
+        if is_structurally_sound:
+            original_table, original_cache = self._load_line_table(self.original_text, original_lines, count_words=False)
+        else:
+            original_table, original_cache = LineTable([], [], [], [], []), None
+        save_original = original_table is None and original_cache is not None
+        save_translated = translated_table is None and translated_cache is not None
+
+        if original_table is None:
+            original_table = self._preprocess_lines(original_lines, count_words=False)
+        if translated_table is None:
+            translated_table = self._preprocess_lines(translated_lines, count_words=True)
+        self._check_lines(original_lines, translated_lines, original_table, translated_table,
+                          is_structurally_sound, has_forbidden, has_corruption)
+
+        if save_original:
+            self._save_line_table(original_cache, original_table)
+        if save_translated:
+            self._save_line_table(translated_cache, translated_table)
+
+        if check_glossary:
+            glossary_candidates = self._collect_glossary_candidates(original_table, translated_table)
+            if glossary_candidates:
+                self._check_glossary_compliance_nlp(glossary_candidates)
+
+    def _preprocess_lines(self, lines: List[str], count_words: bool) -> LineTable:
+        line_types, pure_texts, macros, english_words, total_words = [], [], [], [], []
+        korean_search = self.REGEX["korean"].search
+        tokenize = self.REGEX["word_tokenizer"].findall
+        # 단어마다 정규식을 돌리지 않고 C 수준 str.translate로 허용 문자를 지워 판정 (숫자는 지워지지 않으므로 자연히 제외)
+        table = self.ENGLISH_ONLY_DELETE_TABLE
+        # --- (신규) 같은 내용의 줄(빈 줄, <</if>> 등 반복되는 코드)은 한 번만 분석하고 결과를 재사용 ---
+        memo = {}
+
+        for line in lines:
+            row = memo.get(line)
+            if row is None:
+                line_type, pure_text, line_macros = self._scan_line(line)
+                # --- (신규) 미번역 검사에 필요한 (영어 단어 수, 전체 단어 수)를 전처리 단계에서 함께 계산 ---
+                # 한국어가 있거나 순수 텍스트가 없는 줄은 검사 대상이 아니므로 (0, 0)
+                # ASCII로만 된 텍스트에는 한글이 있을 수 없으므로 정규식 검색 없이 바로 '한국어 없음'으로 판정
+                english_count = word_count = 0
+                if count_words and (line_type == "PURE_TEXT" or line_type == "MIXED_CONTENT") \
+                        and pure_text.strip() and (pure_text.isascii() or not korean_search(pure_text)):
+                    words = tokenize(pure_text)
+                    english_count = sum(1 for word in words if not word.translate(table))
+                    word_count = len(words)
+                row = memo[line] = (line_type, pure_text, line_macros, english_count, word_count)
+            line_types.append(row[0])
+            pure_texts.append(row[1])
+            macros.append(row[2])
+            if count_words:
+                english_words.append(row[3])
+                total_words.append(row[4])
+        return LineTable(line_types, pure_texts, macros, english_words, total_words)
+
+    def _load_line_table(self, text: str, lines: List[str], count_words: bool) -> Tuple[Optional[LineTable], Optional[Path]]:
+        # 반환값: (캐시에 있던 전처리 결과 또는 None, 저장에 쓸 캐시 경로 또는 None)
+        if not self.use_cache:
+            return None, None
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+        cache_path = VALIDATOR_CACHE_DIR / f"v{LINE_CACHE_VERSION}-{digest}{'-w' if count_words else ''}.pkl"
+        try:
+            with open(cache_path, 'rb') as f:
+                table = LineTable(*pickle.load(f))
+        except Exception:
+            return None, cache_path
+        if len(table.line_types) != len(lines):
+            return None, cache_path
+        # 읽은 파일의 수정 시각을 갱신해 정리(_prune_line_cache) 시 최근 사용 파일로 남김
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return table, cache_path
+
+    def _save_line_table(self, cache_path: Path, table: LineTable):
+        # 캐시 파일에는 클래스 참조 없이 기본 자료형 목록만 저장 (실행 방식에 따라 모듈 이름이 달라져도 읽을 수 있도록)
+        _write_cache_pickle(cache_path, tuple(table))
+        _prune_line_cache()
+
+    def _check_lines(self, original_lines, translated_lines, original_table, translated_table,
+                     is_structurally_sound, has_forbidden, has_corruption):
+        # 줄 유형/순수 텍스트/매크로 목록은 미리 전처리된 목록(LineTable)에서 인덱스로 읽음
+        line_types = translated_table.line_types
+        english_words = translated_table.english_words
+        total_words = translated_table.total_words
+        translated_macros = translated_table.macros
+        original_macros = original_table.macros
+        # --- (신규) 반복문 안에서 매번 속성을 조회하지 않도록 자주 쓰는 메서드를 지역 변수로 바인딩 ---
+        check_links = self._check_links_for_playability
+        check_untranslated = self._check_untranslated_content
+        check_forbidden = self._check_forbidden_patterns
+        check_macro = self._check_macro_corruption
+        check_corruption = self._check_text_corruption
+
+        for i, translated_line in enumerate(translated_lines):
             line_num = i + 1
-            original_line = self.original_lines[i] if is_structurally_sound else ""
-            line_type = self._classify_line(translated_line)
-
-            if line_type in ["PURE_TEXT", "MIXED_CONTENT"]:
-                self._check_links_for_playability(translated_line, line_num)
-                self._check_untranslated_content(original_line, translated_line, line_num, is_structurally_sound)
-                self._check_forbidden_patterns(translated_line, line_num)
-                if is_structurally_sound:
-                    self._check_glossary_compliance_nlp(original_line, translated_line, line_num)
+            original_line = original_lines[i] if is_structurally_sound else ""
+            line_type = line_types[i]
+
+            if line_type == "PURE_TEXT" or line_type == "MIXED_CONTENT":
+                check_links(translated_line, line_num)
+                check_untranslated(original_line, translated_line, english_words[i], total_words[i], line_num, is_structurally_sound)
+                # 금지 패턴(한글 + 괄호 속 영어)은 한글이 없는 ASCII 줄에서는 일치할 수 없으므로 정규식 검사를 건너뜀
+                if has_forbidden and not translated_line.isascii():
+                    check_forbidden(translated_line, line_num)
             
-            if is_structurally_sound and line_type in ["PURE_CODE", "MIXED_CONTENT", "UNKNOWN_CODE"]:
-                self._check_macro_corruption(original_line, translated_line, line_num)
-
-            self._check_text_corruption(translated_line, line_num)
-
-    def _check_macro_corruption(self, original_line, translated_line, line_num):
-        original_macros = self.REGEX["macro"].findall(original_line)
-        translated_macros = self.REGEX["macro"].findall(translated_line)
+            # --- (신규) 원본과 똑같은 줄은 매크로 손상 검사를 항상 통과하므로 호출하지 않음 ---
+            # (링크/미번역 검사는 원본 그대로인 줄이 오히려 미번역 경고 대상이므로 위에서 동일 여부와 관계없이 실행)
+            # 줄 구조가 달라 원본 줄과 대응시킬 수 없으면 번역본 매크로의 문자열 리터럴만 검사
+            if (line_type == "PURE_CODE" or line_type == "MIXED_CONTENT") and original_line != translated_line:
+                check_macro(original_macros[i] if is_structurally_sound else None, translated_macros[i], line_num)
+
+            if has_corruption:
+                check_corruption(translated_line, line_num)
+
+    def _check_macro_corruption(self, original_macros, translated_macros, line_num):
+        # 매크로가 없는 줄은 바로 통과 (양쪽 매크로 목록은 전처리에서 이미 얻었으므로 다시 찾지 않음, 원본과 동일한 줄은 호출 전에 걸러짐)
+        if not translated_macros:
+            return
+        if original_macros is None:
+            original_macros = (None,) * len(translated_macros)
         if len(original_macros) == len(translated_macros):
+            korean_search = self.REGEX["korean"].search
             for orig_macro, trans_macro in zip(original_macros, translated_macros):
                 match = self.REGEX["macro_name"].match(trans_macro)
                 if not match: continue
@@ -226,18 +549,20 @@ class TweeL10nValidator:
                 if macro_name not in self.TEXT_MACROS_WHITELIST:
                     content = trans_macro[2:-2].strip()
                     literals = self.REGEX["string_literal"].findall(content)
+                    # 코드 식별자 리터럴은 대부분 ASCII이므로 isascii()로 먼저 걸러 한국어 정규식 검색을 건너뜀
                     for literal in literals:
-                        if self.REGEX["korean"].search(literal) and literal not in self.ALLOWED_POSTPOSITIONS:
+                        if not literal.isascii() and korean_search(literal) and literal not in self.ALLOWED_POSTPOSITIONS:
                             self._add_issue(
                                 severity="CRITICAL", type="매크로 코드 손상",
                                 description=f"번역 금지 의심 매크로(`{macro_name}`) 내부의 코드 식별자 '{literal}'이(가) 번역되었습니다.",
-                                line_num=line_num, original=f"`{orig_macro}`", translated=f"`{trans_macro}`"
+                                line_num=line_num, original=f"`{orig_macro}`" if orig_macro else None, translated=f"`{trans_macro}`"
                             )
                             break
 
     def _check_links_for_playability(self, line, line_num):
-        all_links = self.REGEX["link_with_dest"].findall(line) + [(m, m) for m in self.REGEX["link_simple"].findall(line) if '|' not in m]
-        for display_text, dest in all_links:
+        if "[[" not in line:
+            return
+        for display_text, dest in self._iter_links(line):
             pure_display_text = self._get_pure_text(display_text)
             if not pure_display_text.strip():
                 self._add_issue(severity="WARNING", type="빈 상호작용",
@@ -251,17 +576,14 @@ class TweeL10nValidator:
                                     description=f"링크 표시 텍스트 '{display_text}'이(가) 번역되지 않은 것 같습니다.",
                                     line_num=line_num, translated=line)
 
-    def _check_untranslated_content(self, original_line, translated_line, line_num, is_structurally_sound):
-        pure_translated = self._get_pure_text(translated_line)
-        if not pure_translated.strip() or self.REGEX["korean"].search(pure_translated):
-            return
-        
-        words = self.REGEX["word_tokenizer"].findall(pure_translated)
-        if not words: return
+    def _check_untranslated_content(self, original_line, translated_line, english_words, total_words, line_num, is_structurally_sound):
+        # 단어 수는 전처리(_preprocess_lines)에서 계산됨. 한국어가 있거나 단어가 없는 줄은 total_words가 0
+        if not total_words: return
 
-        english_words = sum(1 for word in words if self.REGEX["english_only"].match(word) and not word.isdigit())
-        if (english_words / len(words)) >= self.ENGLISH_RATIO_THRESHOLD:
-            severity = "WARNING" if is_structurally_sound and original_line.strip() == translated_line.strip() else "INFO"
+        if (english_words / total_words) >= self.ENGLISH_RATIO_THRESHOLD:
+            # 원본과 완전히 같은 줄(부분 번역에서 흔함)은 strip()으로 새 문자열을 만들기 전에 바로 판정
+            is_unchanged = original_line == translated_line or original_line.strip() == translated_line.strip()
+            severity = "WARNING" if is_structurally_sound and is_unchanged else "INFO"
             desc = "이 라인은 번역이 누락되었거나(원본과 동일), 대부분이 영어로 구성되어 검토가 필요합니다."
             self._add_issue(
                 severity=severity, type="미번역 의심 (콘텐츠)", description=desc,
@@ -269,7 +591,8 @@ class TweeL10nValidator:
             )
 
     def _check_text_corruption(self, line, line_num):
-        if self.REGEX["corrupted_char"].search(line):
+        # 한 글자짜리 리터럴은 정규식 대신 C 수준 부분 문자열 검색으로 확인
+        if "\ufffd" in line:
             self._add_issue(
                 severity="CRITICAL", type="텍스트 손상",
                 description="파일 인코딩 문제로 인해 깨진 문자(�)가 발견되었습니다.",
@@ -284,64 +607,97 @@ class TweeL10nValidator:
                 line_num=line_num, translated=line
             )
 
-    def _check_glossary_compliance_nlp(self, original_line, translated_line, line_num):
-        if not self.glossary: return
-        pure_original = self._get_pure_text(original_line)
-        if not pure_original.strip(): return
-        found_eng_terms = {item[1][0] for item in self.glossary_automaton.iter(pure_original)}
-        if not found_eng_terms: return
-        pure_translated = self._get_pure_text(translated_line)
-        tokens = self.kiwi.tokenize(pure_translated)
-        found_kor_tokens = {token.form for token in tokens}
-        for eng_key in found_eng_terms:
-            kor_value = self.glossary.get(eng_key)
-            if not kor_value: continue
-            if kor_value not in found_kor_tokens and kor_value not in pure_translated:
-                if eng_key.lower() in pure_translated.lower():
-                    self._add_issue(
-                        severity="INFO", type="용어집 미적용",
-                        description=f"용어집 단어 '{eng_key}'가 번역되지 않고 원문에 남아있습니다.",
-                        line_num=line_num, original=original_line, translated=translated_line
-                    )
-                else:
-                    self._add_issue(
-                        severity="WARNING", type="용어집 오역/누락 의심",
-                        description=f"용어집 단어 '{eng_key}'의 번역 '{kor_value}'이(가) 누락되었거나 다른 단어로 번역된 것 같습니다.",
-                        line_num=line_num, original=original_line, translated=translated_line
-                    )
+    def _find_glossary_hits(self, pure_originals: List[str]) -> dict:
+        # --- (신규) 원본 순수 텍스트 전체를 '\n'으로 이어 오토마톤을 한 번만 돌리고, 일치 위치를 줄 번호로 환산 ---
+        # 용어집 키에는 줄바꿈이 없으므로 줄 경계를 넘는 일치는 생기지 않음
+        # 오토마톤에는 소문자 키만 있으므로 줄마다 소문자로 변환 (일부 문자는 길이가 바뀌므로 합치기 전에 변환)
+        pure_originals = [pure_original.lower() for pure_original in pure_originals]
+        line_starts = []
+        pos = 0
+        for pure_original in pure_originals:
+            line_starts.append(pos)
+            pos += len(pure_original) + 1
+
+        hits = defaultdict(set)
+        for end_idx, (key, _) in self.glossary_automaton.iter("\n".join(pure_originals)):
+            hits[bisect_right(line_starts, end_idx) - 1].add(key)
+        return hits
+
+    def _collect_glossary_candidates(self, original_table: LineTable, translated_table: LineTable) -> list:
+        # 용어집 검사 대상 줄: (줄 번호, 원본, 번역본, 번역본 순수 텍스트, 원본에서 찾은 용어)
+        hits = self._find_glossary_hits(original_table.pure_texts)
+        line_types = translated_table.line_types
+        candidates = []
+        for i in sorted(hits):
+            if line_types[i] == "PURE_TEXT" or line_types[i] == "MIXED_CONTENT":
+                candidates.append((i + 1, self.original_lines[i], self.translated_lines[i], translated_table.pure_texts[i], hits[i]))
+        return candidates
+
+    def _tokenize_glossary_candidates(self, candidates):
+        # --- (신규) 후보 줄을 모아 형태소 분석기를 한 번에 호출 (줄마다 tokenize를 부르는 오버헤드 제거) ---
+        # 결과는 줄 번호별 형태소 집합으로 보관해 비교 단계에서는 조회만 함
+        token_lists = self.kiwi.tokenize([pure_translated for _, _, _, pure_translated, _ in candidates])
+        self._kor_tokens_by_line = {
+            candidate[0]: {token.form for token in tokens} for candidate, tokens in zip(candidates, token_lists)
+        }
+
+    def _check_glossary_compliance_nlp(self, candidates):
+        self._tokenize_glossary_candidates(candidates)
+        for line_num, original_line, translated_line, pure_translated, found_eng_terms in candidates:
+            found_kor_tokens = self._kor_tokens_by_line[line_num]
+            # 소문자 변환은 용어마다 반복하지 않고, 필요한 줄에서 한 번만 수행
+            pure_translated_lower = None
+            for eng_key in found_eng_terms:
+                kor_value = self.glossary.get(eng_key)
+                if not kor_value: continue
+                if kor_value not in found_kor_tokens and kor_value not in pure_translated:
+                    if pure_translated_lower is None:
+                        pure_translated_lower = pure_translated.lower()
+                    if eng_key.lower() in pure_translated_lower:
+                        self._add_issue(
+                            severity="INFO", type="용어집 미적용",
+                            description=f"용어집 단어 '{eng_key}'가 번역되지 않고 원문에 남아있습니다.",
+                            line_num=line_num, original=original_line, translated=translated_line
+                        )
+                    else:
+                        self._add_issue(
+                            severity="WARNING", type="용어집 오역/누락 의심",
+                            description=f"용어집 단어 '{eng_key}'의 번역 '{kor_value}'이(가) 누락되었거나 다른 단어로 번역된 것 같습니다.",
+                            line_num=line_num, original=original_line, translated=translated_line
+                        )
 
     def generate_report(self, output_path: Path, report_title: str):
         if not self.issues:
-            report_content = f"# ✅ {report_title}: {self.translated_path.name}\n\n**축하합니다! 발견된 문제가 없습니다.**"
+            parts = [f"# ✅ {report_title}: {self.translated_path.name}\n\n**축하합니다! 발견된 문제가 없습니다.**"]
         else:
-            severity_order = {"CRITICAL": 0, "WARNING": 1, "INFO": 2}
-            sorted_issues = sorted(self.issues, key=lambda x: (severity_order.get(x["severity"], 99), x["line_num"]))
+            sorted_issues = sorted(self.issues, key=itemgetter("severity_id", "line_num"))
             
-            summary = defaultdict(int)
-            for issue in self.issues: summary[issue["severity"]] += 1
-
-            report_content = f"# ❗ {report_title}: {self.translated_path.name}\n\n"
-            report_content += f"## 요약\n\n- **총 문제 수: {len(self.issues)}**\n"
-            if summary["CRITICAL"] > 0: report_content += f"- 🔴 **치명적 오류 (CRITICAL): {summary['CRITICAL']}**\n"
-            if summary["WARNING"] > 0: report_content += f"- 🟡 **경고 (WARNING): {summary['WARNING']}**\n"
-            if summary["INFO"] > 0: report_content += f"- 🔵 **정보 (INFO): {summary['INFO']}**\n"
+            summary = Counter(issue["severity"] for issue in self.issues)
+
+            # 문자열 += 반복은 문제 수에 대해 O(N²)이므로 조각을 모아 마지막에 한 번만 합침
+            parts = [f"# ❗ {report_title}: {self.translated_path.name}\n\n"]
+            parts.append(f"## 요약\n\n- **총 문제 수: {len(self.issues)}**\n")
+            if summary["CRITICAL"] > 0: parts.append(f"- 🔴 **치명적 오류 (CRITICAL): {summary['CRITICAL']}**\n")
+            if summary["WARNING"] > 0: parts.append(f"- 🟡 **경고 (WARNING): {summary['WARNING']}**\n")
+            if summary["INFO"] > 0: parts.append(f"- 🔵 **정보 (INFO): {summary['INFO']}**\n")
             
-            report_content += "\n---\n\n## 상세 내용\n\n"
+            parts.append("\n---\n\n## 상세 내용\n\n")
 
+            icons = {"CRITICAL": "🔴", "WARNING": "🟡", "INFO": "🔵"}
             for issue in sorted_issues:
-                icon = {"CRITICAL": "🔴", "WARNING": "🟡", "INFO": "🔵"}.get(issue["severity"], "⚪️")
+                icon = icons.get(issue["severity"], "⚪️")
                 line_info = f"(원본 기준 Line: {issue['line_num']})" if issue['line_num'] > 0 else "(전역 검사)"
-                report_content += f"### {icon} [{issue['severity']}] {issue['type']} {line_info}\n\n"
-                report_content += f"- **문제 설명:** {issue['description']}\n"
-                if issue.get('diff_text'):
-                    report_content += f"\n**차이점 분석 (Diff):**\n```diff\n{issue['diff_text']}\n```\n"
-                if issue.get('original'):
-                    report_content += f"- **원본:** `{issue.get('original')}`\n"
-                if issue.get('translated'):
-                    report_content += f"- **번역본:** `{issue.get('translated')}`\n"
-                report_content += "\n---\n"
+                diff_part = f"\n**차이점 분석 (Diff):**\n```diff\n{issue['diff_text']}\n```\n" if issue.get('diff_text') else ""
+                original_part = f"- **원본:** `{issue['original']}`\n" if issue.get('original') else ""
+                translated_part = f"- **번역본:** `{issue['translated']}`\n" if issue.get('translated') else ""
+                # 문제 하나의 블록을 f-string 하나로 만들어 한 번에 추가
+                parts.append(
+                    f"### {icon} [{issue['severity']}] {issue['type']} {line_info}\n\n"
+                    f"- **문제 설명:** {issue['description']}\n"
+                    f"{diff_part}{original_part}{translated_part}\n---\n"
+                )
         
-        output_path.write_text(report_content, 'utf-8')
+        output_path.write_text("".join(parts), 'utf-8')
         print(f"\n리포트가 '{output_path}'에 저장되었습니다.")
 
     # --- 자동 수정 기능 ---
@@ -349,22 +705,16 @@ class TweeL10nValidator:
         """알려진 규칙적인 구문 오류를 자동으로 수정하고 새 파일에 저장합니다."""
         print("\n--- 자동 수정 작업 시작 ---")
         
-        fix_patterns = [
-            # 패턴 1: <<macro arg_조사>> -> <<macro_조사 arg>>
-            (re.compile(r'<<([a-zA-Z0-9_]+)((?:\s+(?:[0-9]+|"[^"]+"|\$[a-zA-Z0-9_.]+))+)(_\s*[가-힣]+)>>'), r'<<\1\3\2>>'),
-            # 패턴 2: <</macro_조사>> -> <</macro>>조사
-            (re.compile(r'(<</[a-zA-Z0-9_]+)_(\s*[가-힣]+)>>'), r'\1>>\2'),
-            # 패턴 3: </if>> -> <</if>> (안전한 패턴)
-            (re.compile(r'(?<!<)</if>>'), r'<</if>>'),
-        ]
-
         fixed_lines = []
         fixes = []
+        auto_fix_sub = self.REGEX["auto_fix"].sub
         
         for i, line in enumerate(self.translated_lines):
-            modified_line = line
-            for pattern, substitution in fix_patterns:
-                modified_line = pattern.sub(substitution, modified_line)
+            # 세 패턴 모두 '<<'(패턴 1, 2) 또는 '</'(패턴 3)를 포함하므로, 둘 다 없는 줄은 정규식 없이 그대로 통과
+            if "<<" not in line and "</" not in line:
+                fixed_lines.append(line)
+                continue
+            modified_line = auto_fix_sub(self._auto_fix_replacement, line)
             
             if modified_line != line:
                 fixes.append({
@@ -381,31 +731,52 @@ class TweeL10nValidator:
         
         return output_path
 
+    @staticmethod
+    def _auto_fix_replacement(match) -> str:
+        kind = match.lastgroup
+        if kind == "p1":
+            return f"<<{match['p1_name']}{match['p1_josa']}{match['p1_args']}>>"
+        if kind == "p2":
+            return f"{match['p2_close']}>>{match['p2_josa']}"
+        return "<</if>>"
+
     def _generate_fix_report(self, fixes: List[dict]):
         report_path = self.translated_path.with_name(self.translated_path.stem + "_fix_report.md")
         if not fixes:
-            report_content = f"# ✅ 자동 수정 리포트: {self.translated_path.name}\n\n수정할 항목이 없습니다."
+            parts = [f"# ✅ 자동 수정 리포트: {self.translated_path.name}\n\n수정할 항목이 없습니다."]
         else:
-            report_content = f"# 🛠️ 자동 수정 리포트: {self.translated_path.name}\n\n"
-            report_content += f"총 **{len(fixes)}**개의 라인에서 구문 오류가 자동으로 수정되었습니다.\n\n---\n\n"
+            # generate_report와 마찬가지로 조각을 모아 마지막에 한 번만 합침 (+= 반복의 O(N²) 복사 방지)
+            parts = [f"# 🛠️ 자동 수정 리포트: {self.translated_path.name}\n\n"]
+            parts.append(f"총 **{len(fixes)}**개의 라인에서 구문 오류가 자동으로 수정되었습니다.\n\n---\n\n")
             for fix in fixes:
-                report_content += f"### Line: {fix['line_num']}\n"
-                report_content += f"**원본:**\n```twee\n{fix['original']}\n```\n"
-                report_content += f"**수정본:**\n```twee\n{fix['translated']}\n```\n\n---\n"
+                parts.append(f"### Line: {fix['line_num']}\n")
+                parts.append(f"**원본:**\n```twee\n{fix['original']}\n```\n")
+                parts.append(f"**수정본:**\n```twee\n{fix['translated']}\n```\n\n---\n")
         
-        report_path.write_text(report_content, 'utf-8')
+        report_path.write_text("".join(parts), 'utf-8')
         print(f"자동 수정 리포트가 '{report_path}'에 저장되었습니다.")
 
 if __name__ == "__main__":
-    # --- 설정: 여기에 검증할 파일 경로를 직접 입력하세요. ---
-    ORIGINAL_FILE_PATH =
-    TRANSLATED_FILE_PATH =
-    GLOSSARY_FILE_PATH =
-    
+    # --- 설정: 여기에 검증할 파일 경로를 직접 입력하세요. (명령줄 인자로 넘기면 인자가 우선) ---
+    ORIGINAL_FILE_PATH = None
+    TRANSLATED_FILE_PATH = None
+    GLOSSARY_FILE_PATH = None
+    VALIDATION_REPORT_PATH = None  # 비워 두면 번역 파일 옆에 "<이름>_validation_report.md"로 저장
+    # ----------------------------------------------------
+
+    usage = "사용법: python twee_validator.py <원본 파일> <번역 파일> [용어집 파일]"
+    if len(sys.argv) > 1:
+        if len(sys.argv) not in (3, 4):
+            sys.exit(usage)
+        ORIGINAL_FILE_PATH, TRANSLATED_FILE_PATH = sys.argv[1], sys.argv[2]
+        GLOSSARY_FILE_PATH = sys.argv[3] if len(sys.argv) == 4 else None
+    if not ORIGINAL_FILE_PATH or not TRANSLATED_FILE_PATH:
+        sys.exit(usage + "\n(또는 이 파일 아래쪽 설정에 경로를 직접 입력하세요.)")
+
     # 자동 수정 및 검증 결과 파일 이름 설정
     FIXED_TRANSLATED_FILE_PATH = Path(TRANSLATED_FILE_PATH).with_name(Path(TRANSLATED_FILE_PATH).stem + "_fixed.txt")
-    VALIDATION_REPORT_PATH = 
-    # ----------------------------------------------------
+    if not VALIDATION_REPORT_PATH:
+        VALIDATION_REPORT_PATH = Path(TRANSLATED_FILE_PATH).with_name(Path(TRANSLATED_FILE_PATH).stem + "_validation_report.md")
 
     original_p = Path(ORIGINAL_FILE_PATH)
     translated_p = Path(TRANSLATED_FILE_PATH)
@@ -418,6 +789,8 @@ if __name__ == "__main__":
     fixed_file_path = fixer_validator.run_auto_fixer(output_path=fixed_translated_p)
 
     # 1, 2, 3단계: 수정된 파일을 대상으로 전체 검증 실행
-    final_validator = TweeL10nValidator(original_path=original_p, translated_path=fixed_file_path, glossary_path=glossary_p)
+    # 같은 파일을 고쳐 가며 반복 실행하는 경우가 많으므로 줄 전처리 결과를 디스크 캐시에 저장해 재사용
+    final_validator = TweeL10nValidator(original_path=original_p, translated_path=fixed_file_path, glossary_path=glossary_p,
+                                        use_cache=True)
     final_validator.run_all_checks()
     final_validator.generate_report(output_path=output_p, report_title="종합 검증 리포트")